@@ -3,6 +3,7 @@
 package main
 
 import (
+	"encoding/binary"
 	"encoding/json"
 	"fmt"
 	"math"
@@ -19,9 +20,12 @@ import (
 const tolerance = 1e-10
 
 type testData struct {
-	Inputs    [][]float64 `json:"inputs"`
-	NFeatures int         `json:"n_features"`
-	NClasses  int         `json:"n_classes"`
+	Inputs     [][]float64 `json:"inputs"`
+	InputsFile string      `json:"inputs_file"`
+	Shape      []int       `json:"shape"`
+	Dtype      string      `json:"dtype"`
+	NFeatures  int         `json:"n_features"`
+	NClasses   int         `json:"n_classes"`
 }
 
 type modelResult struct {
@@ -50,9 +54,46 @@ func loadTestData(path string) (testData, error) {
 	if err := json.Unmarshal(raw, &td); err != nil {
 		return testData{}, fmt.Errorf("parse test data %s: %w", path, err)
 	}
+	// Inline inputs (the old format) need no further loading.
+	if td.InputsFile == "" {
+		return td, nil
+	}
+	td.Inputs, err = loadBinaryInputs(filepath.Join(filepath.Dir(path), td.InputsFile), td.Shape, td.Dtype)
+	if err != nil {
+		return testData{}, fmt.Errorf("test data %s: %w", path, err)
+	}
 	return td, nil
 }
 
+// loadBinaryInputs reads a row-major little-endian float32 matrix written
+// by generate_models.py via ndarray.tofile.
+func loadBinaryInputs(path string, shape []int, dtype string) ([][]float64, error) {
+	if dtype != "float32" {
+		return nil, fmt.Errorf("unsupported inputs dtype %q", dtype)
+	}
+	if len(shape) != 2 {
+		return nil, fmt.Errorf("unsupported inputs shape %v", shape)
+	}
+	payload, err := os.ReadFile(path)
+	if err != nil {
+		return nil, fmt.Errorf("read inputs %s: %w", path, err)
+	}
+	rows, cols := shape[0], shape[1]
+	if len(payload) != rows*cols*4 {
+		return nil, fmt.Errorf("inputs %s: got %d bytes, want %d for shape %v", path, len(payload), rows*cols*4, shape)
+	}
+	inputs := make([][]float64, rows)
+	for i := 0; i < rows; i++ {
+		row := make([]float64, cols)
+		for j := 0; j < cols; j++ {
+			bits := binary.LittleEndian.Uint32(payload[(i*cols+j)*4:])
+			row[j] = float64(math.Float32frombits(bits))
+		}
+		inputs[i] = row
+	}
+	return inputs, nil
+}
+
 func compareModel(cfg modelConfig) modelResult {
 	// Load with go-lgbm
 	goModel, err := lgbm.ModelFromFile(cfg.ModelFile, true)